@@ -3,9 +3,18 @@
 import json
 
 from cfg import _cfg
-from utils import calculate_distance_bearing
-
+from utils import haversine_distance, initial_bearing, origin_terms, distance_bearing_from, flat_distance_bearing_from
 
+# Lower-cased military hex prefixes, built once rather than per aircraft record
+_MIL_PREFIXES = tuple(prefix.lower() for prefix in _cfg.MIL_PREFIX_LIST)
+# Trig terms of the receiver position, computed once
+_ORIGIN = origin_terms(_cfg.LAT, _cfg.LON)
+# Within this range the flat-earth approximation is good enough for the display
+FLAT_EARTH_MAX_NM = 100
+_distance_bearing = flat_distance_bearing_from if _cfg.RADIUS_NM <= FLAT_EARTH_MAX_NM else distance_bearing_from
+# A degree of latitude is 60.04NM, and no point is nearer than its latitude
+# difference alone, so records outside this band are beyond RADIUS_NM
+_LAT_BAND = _cfg.RADIUS_NM / 60.0
 
 SAMPLE_AIRCRAFT_JSON = """
 { "now" : 1765419480.0,
@@ -13,12 +22,18 @@ SAMPLE_AIRCRAFT_JSON = """
   "aircraft" : [
     {"hex":"a33eda","altitude":19650,"vert_rate":3392,"track":134,"speed":410,"mlat":[],"tisb":[],"messages":13,"seen":0.9,"rssi":-8.8},
     {"hex":"407993","squawk":"6532","flight":"BAW28K  ","lat":37.461090,"lon":-122.152600,"nucp":7,"seen_pos":0.7,"altitude":4550,"vert_rate":-896,"track":26,"speed":189,"category":"A5","mlat":[],"tisb":[],"messages":121,"seen":0.0,"rssi":-3.4},
-    {"hex":"a55785","lat":37.323443,"lon":-122.295745,"nucp":7,"seen_pos":24.9,"altitude":13775,"vert_rate":2496,"track":136,"speed":389,"mlat":[],"tisb":[],"messages":11,"seen":23.5,"rssi":-6.9}
+    {"hex":"a55785","lat":37.323443,"lon":-122.295745,"nucp":7,"seen_pos":24.9,"altitude":13775,"vert_rate":2496,"track":136,"speed":389,"mlat":[],"tisb":[],"messages":11,"seen":23.5,"rssi":-6.9},
+    {"hex":"a1b2c3","flight":"N123 {}  ","lat":37.401200,"lon":-122.101500,"altitude":3500,"track":270,"speed":120,"lastPosition":{"lat":37.401000,"lon":-122.100900,"nic":8,"rc":186,"seen_pos":1.2},"mlat":[],"tisb":[],"messages":57,"seen":0.4,"rssi":-12.1}
   ]
 }
 """
 class Aircraft:
     """Aircraft data from tar1090"""
+    # MicroPython accepts but ignores __slots__, so this saves nothing on the
+    # device; it lists the fields for test_it() and keeps CPython runs lean
+    __slots__ = ('hex_code', 'callsign', 'category', 'squawk', 'lat', 'lon', 'altitude', 'speed',
+                 'vert_rate', 'track', 'distance', 'bearing', 'is_military', 'lat_udeg', 'lon_udeg')
+
     def __init__(self, hex_code: str, callsign: str, category: str, squawk: str, lat: float, lon: float, altitude: int, speed: int, vert_rate: int, track: float, distance: float, bearing: float, is_military: bool = False):
         self.hex_code = hex_code
         self.callsign = callsign
@@ -33,6 +48,9 @@ class Aircraft:
         self.distance = distance
         self.bearing = bearing
         self.is_military = is_military
+        # Position in integer microdegrees for RadarScope's integer projection
+        self.lat_udeg = int(lat * 1000000)
+        self.lon_udeg = int(lon * 1000000)
 
     @staticmethod
     def from_dict(data: dict):
@@ -41,33 +59,113 @@ class Aircraft:
         if 'lat' not in data or 'lon' not in data:
             return None
         lat, lon = data['lat'], data['lon']
-        distance, bearing = calculate_distance_bearing(_cfg.LAT, _cfg.LON, lat, lon)
+        distance = haversine_distance(_cfg.LAT, _cfg.LON, lat, lon)
         if distance > _cfg.RADIUS_NM:
             return None
-        hex_code = data.get('hex', '  ').lower()
-        mil_prefixes = tuple(prefix.lower() for prefix in _cfg.MIL_PREFIX_LIST)
-        is_military = hex_code.startswith(mil_prefixes)
-        return Aircraft(
-            hex_code=hex_code,
-            callsign=data.get('flight', "").strip()[:8] or None,
-            category=data.get('category', None),
-            squawk = data.get('squawk', None),
-            lat=lat, lon=lon,
-            altitude=data.get('altitude', 0) or 0,
-            speed=int(data.get('speed', 0) or 0),
-            vert_rate=int(data.get('vert_rate', 0) or 0),
-            track=data.get('track', 0) or 0,
-            distance=distance,
-            bearing=bearing,
-            is_military=is_military
-        )
+        # Only pay for the bearing once the aircraft survives the range check
+        bearing = initial_bearing(_cfg.LAT, _cfg.LON, lat, lon)
+        aircraft = Aircraft._blank(data.get('hex', '  ').lower())
+        return aircraft.update_from_dict(data, distance, bearing)
+
+    @staticmethod
+    def may_be_in_range(data: dict):
+        """Cheap pre-check that a record has a position possibly within RADIUS_NM, with no trig."""
+        lat = data.get('lat')
+        return lat is not None and 'lon' in data and -_LAT_BAND <= lat - _cfg.LAT <= _LAT_BAND
+
+    @staticmethod
+    def from_list(data_list, pool=None):
+        """Create Aircraft objects for every in-range entry of a list or iterator of dictionaries.
+
+        Records are handled one at a time, so with an iterator (such as
+        fetch.iter_aircraft_json) each dictionary can be freed as soon as its
+        Aircraft is updated.  Records without a position or beyond RADIUS_NM
+        are dropped.  If an AircraftPool is given, objects are recycled from
+        it instead of being allocated, and the list is pre-sized to the
+        pool's count from the previous fetch rather than grown one append
+        at a time.
+        """
+        radius = _cfg.RADIUS_NM
+        may_be_in_range = Aircraft.may_be_in_range
+        distance_bearing = _distance_bearing
+        aircraft_list = [None] * len(pool) if pool is not None else []
+        count = 0
+        for data in data_list:
+            if not may_be_in_range(data):
+                continue
+            distance, bearing = distance_bearing(_ORIGIN, data['lat'], data['lon'], radius)
+            if distance <= radius:
+                hex_code = data.get('hex', '  ').lower()
+                aircraft = pool.acquire(hex_code) if pool is not None else Aircraft._blank(hex_code)
+                aircraft.update_from_dict(data, distance, bearing)
+                if count < len(aircraft_list):
+                    aircraft_list[count] = aircraft
+                else:
+                    aircraft_list.append(aircraft)
+                count += 1
+        del aircraft_list[count:]
+        if pool is not None:
+            pool.release_unseen(aircraft_list)
+        return aircraft_list
+
+    @staticmethod
+    def _blank(hex_code: str):
+        return Aircraft(hex_code, None, None, None, 0.0, 0.0, 0, 0, 0, 0, 0.0, 0.0)
+
+    def update_from_dict(self, data: dict, distance: float, bearing: float):
+        """Overwrite every field except hex_code in place from a dictionary; returns self."""
+        self.callsign = data.get('flight', "").strip()[:8] or None
+        self.category = data.get('category', None)
+        self.squawk = data.get('squawk', None)
+        self.lat = data['lat']
+        self.lon = data['lon']
+        self.lat_udeg = int(self.lat * 1000000)
+        self.lon_udeg = int(self.lon * 1000000)
+        self.altitude = data.get('altitude', 0) or 0
+        self.speed = int(data.get('speed', 0) or 0)
+        self.vert_rate = int(data.get('vert_rate', 0) or 0)
+        self.track = data.get('track', 0) or 0
+        self.distance = distance
+        self.bearing = bearing
+        self.is_military = self.hex_code.startswith(_MIL_PREFIXES)
+        return self
+
+class AircraftPool:
+    """Recycles Aircraft objects across fetches, keyed by hex code"""
+    __slots__ = ('_by_hex', '_free')
+
+    def __init__(self):
+        self._by_hex = {}
+        self._free = []
+
+    def __len__(self):
+        """Number of aircraft currently handed out."""
+        return len(self._by_hex)
+
+    def acquire(self, hex_code: str):
+        """Return the pooled Aircraft for hex_code, reusing a free object for a new hex."""
+        aircraft = self._by_hex.get(hex_code)
+        if aircraft is None:
+            if self._free:
+                aircraft = self._free.pop()
+                aircraft.hex_code = hex_code
+            else:
+                aircraft = Aircraft._blank(hex_code)
+            self._by_hex[hex_code] = aircraft
+        return aircraft
+
+    def release_unseen(self, aircraft_list: list):
+        """Move aircraft not in aircraft_list to the free list, keeping the objects for reuse."""
+        seen = set(aircraft.hex_code for aircraft in aircraft_list)
+        for hex_code in [hex_code for hex_code in self._by_hex if hex_code not in seen]:
+            self._free.append(self._by_hex.pop(hex_code))
 
 def test_it():
     for data in json.loads(SAMPLE_AIRCRAFT_JSON)["aircraft"]:
         print(data)
         craft = Aircraft.from_dict(data)
         if craft is not None:
-            print(f"=> {craft.__dict__}")
+            print(f"=> { {name: getattr(craft, name) for name in Aircraft.__slots__} }")
         else:
             print("=> None")
         print()
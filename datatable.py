@@ -1,52 +1,174 @@
 # MicroPython UI components for CYD-based ILI9341 displays
 
+import gc
 import micropython
+from array import array
 import math
-import utime
+from utime import ticks_ms, ticks_diff
 from ili9341 import color565
 from cfg import _cfg
 
 MEMORY_DEBUG=False
-if MEMORY_DEBUG:
-    import gc
+# Print layout and row-clearing diagnostics (each print blocks on the serial console)
+DEBUG_DRAW=getattr(_cfg, "DEBUG", False)
+# With MEMORY_DEBUG, report memory when (frame & MEMORY_DEBUG_MASK) == 0, i.e. every 64 draws
+MEMORY_DEBUG_MASK=63
+
+# Table layout: column headers and their share of the usable width
+HEADERS = ("CALL", "  ALT", "SPD", "DIST", "TRK", "SQUAWK")
+# Column widths in thousandths of the usable width (integer math, no floats)
+COL_WIDTHS = (280, 190, 120, 150, 120, 130)
+TITLE = "AIRCRAFT DATA"
+
+# Row formatter source, specialized per layout and compiled once with exec().
+# It uses %-formatting: MicroPython compiles f-strings to str.format(), which
+# parses the format spec on every call.  The function is compiled with the
+# native emitter.
+# Each column is padded to its width in characters on the table's character
+# grid, so the six strings can also be joined and drawn as one row.
+# Columns:
+# CALL: callsign (or hex) + optional '/' + CATEGORY, left-aligned to the column width
+# ALT: 5 chars right-aligned (up to 99999 ft) + optional vert_flag +/-
+# SPD: 3 chars right-aligned (up to 999 kts)
+# DIST: 4 chars right-aligned (up to 99.9 nm, or 99+ for 100+)
+# TRK: 4 chars right-aligned (0-359; "° " fails to show up so use space)
+# SQUAWK: 4 chars left-aligned
+_ROW_FORMATTER_SRC = """
+@micropython.native
+def format_row(aircraft):
+    callsign = aircraft.callsign or aircraft.hex_code
+    category = aircraft.category
+    if category:
+        callsign = '%%s/%%s' %% (callsign, category)
+    vert_rate = int(aircraft.vert_rate)
+    vert_flag = "-" if vert_rate < 0 else ("+" if vert_rate > 0 else "")
+    altitude = aircraft.altitude
+    if not (isinstance(altitude, int) and altitude > 0):
+        altitude = "-"
+    speed = aircraft.speed
+    speed = '%%3d' %% int(speed) if speed and speed > 0 else " - "
+    distance = aircraft.distance
+    if distance and distance > 0:
+        # %%4.1f rounds 99.95 and up to "100.0", one character too wide
+        distance = '%%4.1f' %% distance if distance < 99.95 else ('%%3d+' %% int(distance))[:4]
+    else:
+        distance = "   -"
+    track = aircraft.track
+    track = '%%3d ' %% int(track) if track and track > 0 else " -  "
+    squawk = aircraft.squawk
+    squawk = str(squawk)[:4] if squawk is not None else " -"
+    # %%-Ns pads but never truncates, and one wide column would shift every
+    # column after it in a joined row, so cut each to its width
+    return ('%%-%(w0)ds' %% callsign[:%(w0)d],
+            ('%%-%(w1)ds' %% ('%%5s%%s' %% (altitude, vert_flag)))[:%(w1)d],
+            ('%%-%(w2)ds' %% speed)[:%(w2)d],
+            ('%%-%(w3)ds' %% distance)[:%(w3)d],
+            ('%%-%(w4)ds' %% track)[:%(w4)d],
+            ('%%-%(w5)ds' %% squawk)[:%(w5)d])
+"""
+
+# Widest text of the ALT, SPD, DIST and TRK columns; a narrower column would
+# push the columns after it right when the row is drawn as one string.
+_MIN_CHARS = (6, 3, 4, 4)
+
+def _make_row_formatter(col_chars):
+    """Compile a format_row(aircraft) -> 6 column strings function for the column widths in characters."""
+    namespace = {'micropython': micropython}
+    exec(_ROW_FORMATTER_SRC % {'w%d' % i: w for i, w in enumerate(col_chars)}, namespace)
+    return namespace['format_row']
+
+def _nearest(aircraft_list, k):
+    """Return the k closest aircraft, nearest first, without sorting the whole list.
+
+    Keeps a small sorted list and insertion-sorts into it, so the cost is
+    O(N * k) with k = visible rows; ties keep their input order like sorted().
+    """
+    nearest = []
+    for aircraft in aircraft_list:
+        distance = aircraft.distance
+        n = len(nearest)
+        if n == k and distance >= nearest[-1].distance:
+            continue
+        i = n
+        while i > 0 and nearest[i - 1].distance > distance:
+            i -= 1
+        nearest.insert(i, aircraft)
+        if n == k:
+            nearest.pop()
+    return nearest
+
+# Row state of a row position nothing has been drawn at yet
+_NO_ROW = (None, False)
 
 class DrawState:
     """Encapsulates all drawing state for the data table."""
+    __slots__ = ('rows', 'row_y0', 'row_h', 'num_cols', 'cells', 'text', 'footer', 'shapes',
+                 'chrome_drawn', 'row_state', 'row_raw', 'blank_from', 'max_rows')
+
     def __init__(self):
-        # Row layout for hit testing: (hex_code, y_pos, row_height)
+        # Row layout for hit testing: hex_code per row, top to bottom.
+        # Rows are contiguous and equally tall, so a row index is just
+        # (y - row_y0) // row_h.
         self.rows = []
-        # Text cache for write-through optimization: (x, y) -> text
+        self.row_y0 = 0
+        self.row_h = 1
+        # Text cache for write-through optimization of the table cells:
+        # cells[col * max_rows + row] -> text, sized by set_grid()
+        self.num_cols = 0
+        self.cells = []
+        # Text cache for the title and headers: (x, y) -> text
         self.text = {}
-        # Row state tracking: y_pos -> (hex_code, is_selected)
-        self.row_state = {}
+        # Footer status lines last drawn, by line number
+        self.footer = []
+        # Lines and rectangles already on screen: (kind, x1, y1, x2_or_w, y2_or_h, color)
+        self.shapes = set()
+        # Border, title, headers and separator are on screen
+        self.chrome_drawn = False
+        # Row state tracking: row_state[row] -> (hex_code, is_selected), sized by set_grid()
+        self.row_state = []
+        # Source values each row was last formatted from: row_raw[row] -> tuple
+        self.row_raw = []
+        # Rows from this index on are known to be blank on screen
+        self.blank_from = 0
         # Calculated maximum rows that can fit
         self.max_rows = 0
     
     def clear(self):
         """Clear all state."""
         self.rows = []
+        self.cells = [None] * len(self.cells)
         self.text = {}
-        self.row_state = {}
-    
-    def get_row_state(self, y_pos, default=(None, False)):
-        """Get the state of a row at given y position."""
-        return self.row_state.get(y_pos, default)
+        self.footer = []
+        self.shapes = set()
+        self.chrome_drawn = False
+        self.row_state = [_NO_ROW] * len(self.row_state)
+        self.row_raw = [None] * len(self.row_raw)
+        self.blank_from = self.max_rows
     
-    def set_row_state(self, y_pos, hex_code, is_selected):
-        """Set the state of a row at given y position."""
-        self.row_state[y_pos] = (hex_code, is_selected)
-    
-    def add_row(self, hex_code, y_pos, row_height):
-        """Add a row to the layout."""
-        self.rows.append((hex_code, y_pos, row_height))
+    def set_grid(self, num_cols, max_rows):
+        """Size the cell and row caches for num_cols x max_rows, dropping any cached state."""
+        self.num_cols = num_cols
+        self.max_rows = max_rows
+        self.cells = [None] * (num_cols * max_rows)
+        self.row_state = [_NO_ROW] * max_rows
+        self.row_raw = [None] * max_rows
+        self.blank_from = max_rows
     
     def find_row(self, y):
         """Find which row contains the given y coordinate."""
-        for hex_code, row_y, row_h in self.rows:
-            if y >= (row_y - 1) and y < (row_y - 1 + row_h):
-                return hex_code
+        idx = (y - self.row_y0) // self.row_h
+        if 0 <= idx < len(self.rows):
+            return self.rows[idx]
         return None
     
+    def cached_text_count(self):
+        """Number of cached texts: title/header entries plus the table cells filled in."""
+        count = len(self.text)
+        for text in self.cells:
+            if text is not None:
+                count += 1
+        return count
+    
     def get_text(self, x, y):
         """Get cached text at position."""
         return self.text.get((x, y))
@@ -57,6 +179,11 @@ class DrawState:
 
 class DataTable:
     """Aircraft data table component using CYD display primitives."""
+    __slots__ = ('fb', 'x', 'y', 'width', 'height', 'table_font', 'status_font', 'cfg',
+                 'table_font_h', 'status_font_h', 'compact', 'state', '_frame', '_status_key',
+                 '_title_x', '_headers_y', '_col_positions', '_format_row', '_whole_rows',
+                 '_start_y', '_row_h', '_nearest_src', '_nearest_rows')
+
     def __init__(self, fb, x, y, width, height,
                  table_font=None, status_font=None,
                  compact=False,
@@ -80,210 +207,287 @@ class DataTable:
         self.compact = compact
         # Consolidated state management
         self.state = DrawState()
+        self._frame = 0
+        # Footer inputs from the last draw, see draw()
+        self._status_key = None
+        self._recalc_layout()
 
-    def draw(self, aircraft_list, status, last_update_ticks_ms, selected_hex=None):
-        """Render the table and status information."""
-        # Clear row layout for this draw
-        self.state.rows = []
-        
-        # border
-        # print(f"self.fb.draw_rectangle({self.x=}, {self.y=}, {self.width=}, {self.height=}, {self.cfg.BRIGHT_GREEN=})")
-        self.fb.draw_rectangle(self.x, self.y, self.width, self.height, self.cfg.BRIGHT_GREEN)
-        # title
-        title = "AIRCRAFT DATA"
+    def resize(self, width, height):
+        """Change the table size; recomputes the layout and drops cached drawing state."""
+        self.width = width
+        self.height = height
+        self.clear_cache()
+        self._recalc_layout()
+
+    def _recalc_layout(self):
+        """Compute the geometry that only depends on position, size, fonts and compact mode."""
         if self.table_font is not None:
-            title_x = self.x + (self.width // 2) - (len(title) * self.table_font.width // 2)
-            self.fb.draw_text(title_x, self.y + 4, title, self.table_font, self.cfg.AMBER, self.cfg.BLACK)
+            self._title_x = self.x + (self.width // 2) - (len(TITLE) * self.table_font.width // 2)
         else:
-            title_x = self.x + (self.width // 2) - (len(title) * 8 // 2)
-            self.fb.draw_text8x8(title_x, self.y + 4, title, self.cfg.AMBER, background=self.cfg.BLACK)
+            self._title_x = self.x + (self.width // 2) - (len(TITLE) * 8 // 2)
 
         # headers and column positions
-        headers_y = self.y + 14
-        headers = ["CALL", "  ALT", "SPD", "DIST", "TRK", "SQUAWK"]
+        self._headers_y = self.y + 14
         total_width = self.width - 10
-        col_widths = [0.28, 0.19, 0.12, 0.15, 0.12, 0.13]
-        col_positions = []
-        current_x = self.x + 5
-        for ratio in col_widths:
-            w = int(total_width * ratio)
-            col_positions.append(current_x)
-            current_x += w
-        print(f"{total_width=} {col_widths=} {col_positions=}")
-
-        # draw headers
-        for i, h in enumerate(headers):
-            if self.table_font is not None:
-                self.fb.draw_text(col_positions[i], headers_y, h, self.table_font, self.cfg.AMBER, self.cfg.BLACK)
-            else:
-                self.fb.draw_text8x8(col_positions[i], headers_y, h, self.cfg.AMBER, background=self.cfg.BLACK)
+        # Columns start on the character grid of the table font so that a
+        # whole row can be drawn with one draw_text() call
+        char_w = self.table_font.width + 1 if self.table_font is not None else 8
+        col_positions = array('H')
+        col_chars = []
+        x0 = self.x + 5
+        offset = 0
+        for permille in COL_WIDTHS:
+            col_positions.append(x0 + offset // char_w * char_w)
+            offset += total_width * permille // 1000
+        for j in range(len(col_positions) - 1):
+            col_chars.append((col_positions[j + 1] - col_positions[j]) // char_w)
+        col_chars.append(4)
+        self._col_positions = col_positions
+        if DEBUG_DRAW:
+            print(f"{total_width=} {COL_WIDTHS=} {self._col_positions=}")
 
-        # separator line
-        self.fb.draw_line(self.x + 4, headers_y + self.table_font_h, self.x + self.width - 4, headers_y + self.table_font_h, self.cfg.DIM_GREEN)
+        self._format_row = _make_row_formatter(col_chars)
+        # Join rows into one string only if no column text can overflow its column
+        self._whole_rows = all(w >= m for w, m in zip(col_chars[1:], _MIN_CHARS))
 
         # Calculate maximum rows that can fit
-        start_y = headers_y + self.table_font_h + 4
-        row_h = self.table_font_h + 2
-        # print(f"{row_h=}")
-        
+        self._start_y = self._headers_y + self.table_font_h + 4
+        self._row_h = self.table_font_h + 2
+
         # Calculate available space for rows
         if self.compact:
-            available_height = self.height - (start_y - self.y)
-            # print(f"{available_height=} = {self.height=} - ({start_y=} - {self.y=})")
+            available_height = self.height - (self._start_y - self.y)
         else:
             # Calculate status footer height dynamically
             status_info_lines = 5  # e.g. STATUS, CONTACTS, RANGE, INTERVAL, NEXT UPDATE
             footer_height = status_info_lines * self.status_font_h + 8
-            available_height = self.height - (start_y - self.y) - footer_height
-        
-        self.state.max_rows = max(1, int(available_height / row_h))
-        print(f"{self.state.max_rows=}")
-        
+            available_height = self.height - (self._start_y - self.y) - footer_height
+
+        self.state.set_grid(len(HEADERS), max(1, int(available_height / self._row_h)))
+        # Rows chosen by _nearest() for the list last drawn, see draw()
+        self._nearest_src = None
+        self._nearest_rows = []
+        if DEBUG_DRAW:
+            print(f"{self.state.max_rows=}")
+
+    def draw(self, aircraft_list, status, last_update_ticks_ms, selected_hex=None, military_count=None):
+        """Render the table and status information.
+
+        military_count may be supplied by the fetch layer, which already
+        knows it; otherwise it is counted here for the footer.
+
+        The nearest rows are picked again only when aircraft_list is a
+        different list object than last time, so pass a new list for new
+        data, as AircraftTracker does, rather than changing one in place.
+        """
+        # Bind hot attribute lookups to locals once per draw
+        cfg = self.cfg
+        BLACK = cfg.BLACK
+        YELLOW = cfg.YELLOW
+        AMBER = cfg.AMBER
+        RED = cfg.RED
+        BRIGHT_GREEN = cfg.BRIGHT_GREEN
+        state = self.state
+        draw_text = self.fb.draw_text
+        fill_rectangle = self.fb.fill_rectangle
+        cells = state.cells
+        row_state = state.row_state
+        row_raw = state.row_raw
+        format_row = self._format_row
+        table_font = self.table_font
+        whole_rows = self._whole_rows and table_font is not None
+        max_rows = state.max_rows
+        row_x = self.x + 4
+        row_w = self.width - 8
+
+        headers_y = self._headers_y
+        col_positions = self._col_positions
+        row_x0 = col_positions[0]
+
+        # border, title, headers and separator are only sent to the display
+        # again after clear_cache(); skip even the cache checks until then
+        if not state.chrome_drawn:
+            self._draw_rectangle_cached(self.x, self.y, self.width, self.height, BRIGHT_GREEN)
+            self._draw_text_cached(self._title_x, self.y + 4, TITLE, table_font, AMBER)
+
+            # draw headers
+            for i, h in enumerate(HEADERS):
+                self._draw_text_cached(col_positions[i], headers_y, h, table_font, AMBER)
+
+            # separator line
+            self._draw_line_cached(self.x + 4, headers_y + self.table_font_h, self.x + self.width - 4, headers_y + self.table_font_h, cfg.DIM_GREEN)
+            state.chrome_drawn = True
+
+        start_y = self._start_y
+        row_h = self._row_h
+
+        # Row layout for hit testing, rebuilt for this draw (see DrawState.find_row)
+        rows = state.rows = []
+        state.row_y0 = start_y - 1
+        state.row_h = row_h
+        add_row = rows.append
+
         # rows (sorted by distance)
-        sorted_ac = sorted(aircraft_list, key=lambda a: getattr(a, "distance", 9999))
-        num_rows = min(len(sorted_ac), self.state.max_rows)
-        
-        # Track which positions we're drawing to
-        new_text = {}
-        new_row_state = {}
+        if aircraft_list is self._nearest_src:
+            sorted_ac = self._nearest_rows
+        else:
+            sorted_ac = self._nearest_rows = _nearest(aircraft_list, max_rows)
+            self._nearest_src = aircraft_list
+        num_rows = len(sorted_ac)
         
-        for i, aircraft in enumerate(sorted_ac[:self.state.max_rows]):
-            # print(f"table: {i=} {aircraft.__dict__}")
+        for i, aircraft in enumerate(sorted_ac):
             y_pos = start_y + i * row_h
             
+            hex_code = aircraft.hex_code
+            
             # Store row layout for hit testing
-            self.state.add_row(aircraft.hex_code, y_pos, row_h)
+            add_row(hex_code)
             
             # Determine if this row needs background update
-            is_selected = (selected_hex is not None and aircraft.hex_code == selected_hex)
+            is_selected = (selected_hex is not None and hex_code == selected_hex)
             
             # Check if background needs to be updated
             # Only update if: hex_code changed at this y_pos OR selection state changed
-            old_hex, old_selected = self.state.get_row_state(y_pos)
-            needs_bg_update = (old_hex != aircraft.hex_code) or (old_selected != is_selected)
+            old_hex, old_selected = row_state[i]
+            needs_bg_update = (old_hex != hex_code) or (old_selected != is_selected)
             
             if needs_bg_update:
-                if is_selected:
-                    self.fb.fill_rectangle(self.x + 4, y_pos - 1, self.width - 8, row_h, self.cfg.YELLOW)
-                else:
-                    self.fb.fill_rectangle(self.x + 4, y_pos - 1, self.width - 8, row_h, self.cfg.BLACK)
-            
-            # Track what's at this row position
-            new_row_state[y_pos] = (aircraft.hex_code, is_selected)
-            
-            color = self.cfg.RED if aircraft.is_military else self.cfg.BRIGHT_GREEN
-            # Format columns with appropriate widths
-            # CALL: 8 chars left-aligned + optional '/' + CATEGORY 2 chars
-            # ALT: 5 chars right-aligned (up to 99999 ft) + optional vert_flag +/-
-            # SPD: 3 chars right-aligned (up to 999 kts)
-            # DIST: 4 chars right-aligned (up to 99.9 nm, or 99+ for 100+)
-            # TRK: 4 chars right-aligned (0-359°)
-            # SQUAWK: 4 chars left-aligned
-            callsign = aircraft.callsign if aircraft.callsign else aircraft.hex_code
-            speed = "{:>3}".format(int(aircraft.speed)) if getattr(aircraft, "speed", 0) and aircraft.speed > 0 else " - "
-            vert_rate = int(getattr(aircraft, "vert_rate", 0))
-            category = aircraft.category
-
-            # Show category after callsign, if present
-            if category:
-                callsign = "{}/{}".format(callsign, category)
-            callsign = "{:<10}".format(callsign[:10])
-            
-            # Show +/- after altitude based on vert_rate
-            if vert_rate < 0:
-                vert_flag = "-"
-            elif vert_rate > 0:
-                vert_flag = "+"
-            else:
-                vert_flag = ""
-            altitude = "{:>5}{}".format(aircraft.altitude if isinstance(aircraft.altitude, int) and aircraft.altitude > 0 else "-", vert_flag)
-
-            # Distance: show one decimal place up to 99.9, then show as integer 100+
-            if getattr(aircraft, "distance", 0) and aircraft.distance > 0:
-                if aircraft.distance < 100:
-                    distance = "{:>4}".format("{:.1f}".format(aircraft.distance))
-                else:
-                    distance = "{:>3}+".format(int(aircraft.distance))[:4]
-            else:
-                distance = "{:>4}".format("-")
-            
-            # Track: show with degree symbol (track is 0-359)
-            if getattr(aircraft, "track", 0) and aircraft.track > 0:
-                # "° " fails to show up so use space
-                track = "{:>3} ".format(int(aircraft.track))
-            else:
-                track = " -  "
+                # A joined row string paints its own black background over the
+                # old row text, so a fill is only needed for an empty row or
+                # when a yellow selection background appears or goes away
+                if old_hex is None or old_selected or is_selected or not whole_rows:
+                    fill_rectangle(row_x, y_pos - 1, row_w, row_h, YELLOW if is_selected else BLACK)
+                # Track what's at this row position
+                row_state[i] = (hex_code, is_selected)
             
-            # Squawk: handle None/empty safely
-            squawk_val = getattr(aircraft, "squawk", None)
-            if squawk_val is not None:
-                squawk = "{:<4}".format(str(squawk_val)[:4])
-            else:
-                squawk = " -  "
+            # Skip formatting and drawing when none of the displayed values changed
+            raw = (aircraft.callsign, aircraft.category, aircraft.altitude, aircraft.vert_rate,
+                   aircraft.speed, aircraft.distance, aircraft.track, aircraft.squawk)
+            if not needs_bg_update and row_raw[i] == raw:
+                continue
+            row_raw[i] = raw
             
-            cols = [callsign, altitude, speed, distance, track, squawk]
+            color = RED if aircraft.is_military else BRIGHT_GREEN
+            cols = format_row(aircraft)
             
             # Use black text on yellow background for selected row
-            text_color = self.cfg.BLACK if is_selected else color
-            bg_color = self.cfg.YELLOW if is_selected else self.cfg.BLACK
+            text_color = BLACK if is_selected else color
+            bg_color = YELLOW if is_selected else BLACK
             
-            for j, val in enumerate(cols):
-                # Fields are now properly sized with formatting, no extra padding needed
-                text_str = val
-                cache_key = (col_positions[j], y_pos)
-                
+            # cell index col * max_rows + row, starting at column 0 of row i
+            cell = i
+            if needs_bg_update and whole_rows:
+                # Repainted row: send every column as one string
+                draw_text(row_x0, y_pos, "".join(cols), table_font, text_color, bg_color)
+                for text_str in cols:
+                    cells[cell] = text_str
+                    cell += max_rows
+                continue
+            for j, text_str in enumerate(cols):
                 # Draw if: text changed OR background was just updated (which cleared the text)
-                if needs_bg_update or self.state.get_text(col_positions[j], y_pos) != text_str:
-                    self.fb.draw_text(col_positions[j], y_pos, text_str, self.table_font, text_color, bg_color)
-                
-                new_text[cache_key] = text_str
+                if needs_bg_update or cells[cell] != text_str:
+                    draw_text(col_positions[j], y_pos, text_str, table_font, text_color, bg_color)
+                    cells[cell] = text_str
+                cell += max_rows
         
-        # Clear remaining rows
-        if num_rows < self.state.max_rows:
-            clear_y = start_y + num_rows * row_h
-            clear_height = (self.state.max_rows - num_rows) * row_h - 1
-            print(f"clear: {num_rows=} {self.state.max_rows=} self.fb.fill_rectangle({self.x=} + 4, {clear_y}, {self.width=} - 8, {clear_height=}, self.cfg.BLACK)")
-            self.fb.fill_rectangle(self.x + 4, clear_y, self.width - 8, clear_height, self.cfg.BLACK)
-        
-        # Update state
-        self.state.text = new_text
-        self.state.row_state = new_row_state
+        # Clear rows that were drawn last time but are now empty; rows from
+        # state.blank_from on are already blank
+        blank_from = state.blank_from
+        if num_rows < blank_from:
+            clear_y = start_y + num_rows * row_h - 1
+            clear_height = (blank_from - num_rows) * row_h
+            if DEBUG_DRAW:
+                print(f"clear: {num_rows=} {blank_from=} self.fb.fill_rectangle({row_x=}, {clear_y}, {row_w=}, {clear_height=}, BLACK)")
+            fill_rectangle(row_x, clear_y, row_w, clear_height, BLACK)
+            # Forget cleared rows; their cached cell text is harmless because a
+            # row that reappears always gets a background update and full redraw
+            for i in range(num_rows, blank_from):
+                row_state[i] = _NO_ROW
+        state.blank_from = num_rows
 
         if not self.compact:
             # footer status
-            military_count = sum(1 for a in aircraft_list if a.is_military)
+            if military_count is None:
+                military_count = 0
+                for aircraft in aircraft_list:
+                    if aircraft.is_military:
+                        military_count += 1
+            # countdown in whole seconds, so it changes at most once a second
             if last_update_ticks_ms:
-                elapsed = (utime.ticks_ms() - last_update_ticks_ms) / 1000.0
+                countdown = max(0, cfg.FETCH_INTERVAL - ticks_diff(ticks_ms(), last_update_ticks_ms) // 1000)
             else:
-                elapsed = 9999.0
-            countdown = max(0, self.cfg.FETCH_INTERVAL - elapsed)
-            countdown_text = "{:02d}S".format(int(countdown)) if countdown > 0 else "UPDATING"
-            status_info = [
-                "STATUS: {}".format(status),
-                "CONTACTS: {} ({} MIL)".format(len(aircraft_list), military_count),
-                "RANGE: {}NM".format(self.cfg.RADIUS_NM),
-                "TEXT_CACHE: {}".format(len(self.state.text)),
-                "ROW_STATE_CACHE: {}".format(len(self.state.row_state)),
-#                "INTERVAL: {}S".format(self.cfg.FETCH_INTERVAL),
-#                "NEXT UPDATE: {}".format(countdown_text),
-            ]
-
-            status_y = self.y + self.height - (len(status_info) * self.status_font_h) - 4
-            for i, s in enumerate(status_info):
-                color = self.cfg.YELLOW if "UPDATING" in s else self.cfg.BRIGHT_GREEN
-                if self.status_font is not None:
-                    self.fb.draw_text(self.x + 6, status_y + i * self.status_font_h, s, self.status_font, color, self.cfg.BLACK)
-                else:
-                    self.fb.draw_text8x8(self.x + 6, status_y + i * self.status_font_h, s, color, background=self.cfg.BLACK)
+                countdown = 0
+            # The cache count walks every cell, so only report it with MEMORY_DEBUG
+            cached_texts = state.cached_text_count() if MEMORY_DEBUG else None
+            # Only rebuild and redraw the footer when one of its inputs changed
+            status_key = (status, len(aircraft_list), military_count, countdown,
+                          cached_texts, num_rows)
+            if status_key != self._status_key:
+                self._status_key = status_key
+                countdown_text = f"{countdown:02d}S" if countdown > 0 else "UPDATING"
+                status_info = [
+                    f"STATUS: {status}",
+                    f"CONTACTS: {len(aircraft_list)} ({military_count} MIL)",
+                    f"RANGE: {cfg.RADIUS_NM}NM",
+                    f"ROW_STATE_CACHE: {num_rows}",
+#                    f"INTERVAL: {self.cfg.FETCH_INTERVAL}S",
+#                    f"NEXT UPDATE: {countdown_text}",
+                ]
+                if cached_texts is not None:
+                    status_info.insert(3, f"TEXT_CACHE: {cached_texts}")
+
+                footer = state.footer
+                if len(footer) != len(status_info):
+                    footer[:] = [""] * len(status_info)
+                status_y = self.y + self.height - (len(status_info) * self.status_font_h) - 4
+                for i, s in enumerate(status_info):
+                    old = footer[i]
+                    if s == old:
+                        continue
+                    footer[i] = s
+                    color = YELLOW if "UPDATING" in s else BRIGHT_GREEN
+                    # Pad with spaces to erase the tail of a longer previous line
+                    if len(s) < len(old):
+                        s = f"{s:<{len(old)}}"
+                    self._draw_text(self.x + 6, status_y + i * self.status_font_h, s, self.status_font, color)
     
         if MEMORY_DEBUG:
-            self.show_memory_stats()
+            self._frame += 1
+            if self._frame & MEMORY_DEBUG_MASK == 0:
+                self.show_memory_stats()
+
+    def _draw_text_cached(self, x, y, text, font, color):
+        """Draw text on black unless the same text is already cached at (x, y)."""
+        if self.state.get_text(x, y) == text:
+            return
+        self._draw_text(x, y, text, font, color)
+        self.state.set_text(x, y, text)
+
+    def _draw_text(self, x, y, text, font, color):
+        """Draw text on black with font, or with the built-in 8x8 font if font is None."""
+        if font is not None:
+            self.fb.draw_text(x, y, text, font, color, self.cfg.BLACK)
+        else:
+            self.fb.draw_text8x8(x, y, text, color, background=self.cfg.BLACK)
+
+    def _draw_line_cached(self, x1, y1, x2, y2, color):
+        """Draw a line unless it is already on screen."""
+        key = ('line', x1, y1, x2, y2, color)
+        if key not in self.state.shapes:
+            self.fb.draw_line(x1, y1, x2, y2, color)
+            self.state.shapes.add(key)
+
+    def _draw_rectangle_cached(self, x, y, w, h, color):
+        """Draw a rectangle outline unless it is already on screen."""
+        key = ('rect', x, y, w, h, color)
+        if key not in self.state.shapes:
+            self.fb.draw_rectangle(x, y, w, h, color)
+            self.state.shapes.add(key)
 
     def clear_cache(self):
         """Clear the drawing state, called when screen is cleared."""
         self.state.clear()
-        if MEMORY_DEBUG:
-            self.show_memory_stats()
+        self._status_key = None
 
     def pick_hex(self, x, y):
         """
@@ -321,10 +525,11 @@ class DataTable:
         return (x >= self.x and x < self.x + self.width and 
                 y >= self.y and y < self.y + self.height)
 
-    def show_memory_stats(self):
+    def show_memory_stats(self, collect=False):
+        """Print heap usage; only forces a collection when collect is set."""
         print("gc:")
-        # Force garbage collection to free up memory
-        gc.collect()
+        if collect:
+            gc.collect()
         # Get the number of bytes currently allocated
         allocated_memory = gc.mem_alloc()
         # Get the number of free bytes available in the heap
@@ -332,5 +537,12 @@ class DataTable:
         print(f"Allocated memory: {allocated_memory} bytes")
         print(f"Free memory: {free_memory} bytes")
         print(f"Total heap size: {allocated_memory + free_memory} bytes")
-        # Print a detailed summary of RAM utilization (optional)
+
+    def debug_dump(self):
+        """On-demand diagnosis: print table layout, cache sizes and a full heap summary."""
+        state = self.state
+        print(f"table: frame={self._frame} max_rows={state.max_rows} rows={len(state.rows)} "
+              f"text_cache={state.cached_text_count()} row_state={len(state.row_state)} shapes={len(state.shapes)}")
+        print(f"table: col_positions={self._col_positions} start_y={self._start_y} row_h={self._row_h}")
+        self.show_memory_stats(collect=True)
         micropython.mem_info()
@@ -1,10 +1,336 @@
 # Modified for MicroPython from
 # https://github.com/nicespoon/retro-adsb-radar/blob/main/data_fetcher.py
-import requests
+import json
+import socket
 import time
+import utime
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
 
 from cfg import _cfg
-from aircraft import Aircraft
+from aircraft import Aircraft, AircraftPool
+
+# Checked once; older cfg.py files have no DEBUG or FETCH_TTL_MS setting
+DEBUG = getattr(_cfg, "DEBUG", False)
+FETCH_TTL_MS = getattr(_cfg, "FETCH_TTL_MS", 1000)
+
+class AircraftJSONParser:
+    """Incremental decoder for the "aircraft" array of a dump1090 aircraft.json body.
+
+    feed() takes the body in chunks of any size and returns the records it
+    completed as dicts, so the whole document is never held in memory.
+    Records may nest objects (readsb's "lastPosition":{...}), so each one
+    ends where its brace depth returns to zero, not counting braces inside
+    strings.  A record that does not decode is skipped.  done is set once
+    the array is closed.
+    """
+    def __init__(self):
+        self._buf = b''
+        self._in_array = False
+        # Scan state carried between chunks: next offset to look at, brace
+        # depth, string/escape flags and the offset of the open record
+        self._scan = 0
+        self._depth = 0
+        self._in_str = False
+        self._esc = False
+        self._start = -1
+        self.done = False
+
+    def feed(self, chunk):
+        records = []
+        if self.done:
+            return records
+        buf = self._buf + chunk
+        if not self._in_array:
+            # Skip ahead to the opening '[' of the aircraft array
+            key = buf.find(b'"aircraft"')
+            if key < 0:
+                # keep enough of the tail for a key split across chunks
+                self._buf = buf[-10:]
+                return records
+            start = buf.find(b'[', key)
+            if start < 0:
+                self._buf = buf[key:]
+                return records
+            buf = buf[start + 1:]
+            self._in_array = True
+        i = self._scan
+        depth = self._depth
+        in_str = self._in_str
+        esc = self._esc
+        start = self._start
+        n = len(buf)
+        while i < n:
+            c = buf[i]
+            if in_str:
+                if esc:
+                    esc = False
+                elif c == 0x5c:  # backslash
+                    esc = True
+                elif c == 0x22:  # "
+                    in_str = False
+            elif c == 0x22:
+                in_str = True
+            elif c == 0x7b:  # {
+                if depth == 0:
+                    start = i
+                depth += 1
+            elif c == 0x7d:  # }
+                depth -= 1
+                if depth == 0:
+                    try:
+                        records.append(json.loads(buf[start:i + 1]))
+                    except ValueError as e:
+                        if DEBUG:
+                            print(f"Skipping undecodable record: {e}")
+                    start = -1
+            elif c == 0x5d and depth == 0:  # ] closes the array
+                self.done = True
+                self._buf = b''
+                return records
+            i += 1
+        # Keep only the unfinished record, if any
+        if start >= 0:
+            self._buf = buf[start:]
+            self._scan = i - start
+            self._start = 0
+        else:
+            self._buf = b''
+            self._scan = 0
+            self._start = -1
+        self._depth = depth
+        self._in_str = in_str
+        self._esc = esc
+        return records
+
+def iter_aircraft_json(stream, chunk_size=512):
+    """Yield each record of the "aircraft" array read from stream as a dict."""
+    parser = AircraftJSONParser()
+    while not parser.done:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            return
+        for record in parser.feed(chunk):
+            yield record
+
+def _parse_status_line(line):
+    """Return (status_code, keep_alive) from an HTTP status line."""
+    return int(line.split(None, 2)[1]), not line.startswith(b'HTTP/1.0')
+
+def _parse_header_line(line, length, keep_alive, etag):
+    """Update (length, keep_alive, etag) from one HTTP header line."""
+    name, value = line.split(b':', 1)
+    name = name.strip().lower()
+    value = value.strip()
+    if name == b'content-length':
+        length = int(value)
+    elif name == b'connection':
+        keep_alive = value.lower() != b'close'
+    elif name == b'etag':
+        etag = value
+    elif name == b'transfer-encoding' and value.lower() != b'identity':
+        raise ValueError(f"Unsupported transfer-encoding: {value}")
+    return length, keep_alive, etag
+
+class KeepAliveHTTP:
+    """HTTP/1.1 GET of one URL over a connection that is kept open between fetches.
+
+    The host is resolved once, and the socket is only reopened after an
+    error or when the server closes the connection, so repeated fetches
+    skip the DNS lookup and TCP handshake.  get() returns a response with
+    status_code, raw and close(), like requests.get().  The ETag of the last
+    response is sent back as If-None-Match, so an unchanged document comes
+    back as an empty 304 Not Modified.
+    """
+    def __init__(self, url, timeout=10):
+        proto, _, host, path = url.split('/', 3)
+        if proto != 'http:':
+            raise ValueError(f"Unsupported protocol: {proto}")
+        port = 80
+        if ':' in host:
+            host, port = host.split(':', 1)
+            port = int(port)
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._request = f"GET /{path} HTTP/1.1\r\nHost: {host}\r\nConnection: keep-alive\r\n".encode()
+        self.etag = None
+        self._addr = None
+        self._sock = None
+
+    def close(self):
+        """Close the connection; the next get() opens a new one."""
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+            self._sock = None
+
+    def get(self):
+        """Send the request and read the response headers."""
+        if self._sock is not None:
+            try:
+                return self._get()
+            except OSError:
+                # The server may have dropped the idle connection; retry once on a fresh one
+                self.close()
+        return self._get()
+
+    def _request_bytes(self):
+        if self.etag is None:
+            return self._request + b'\r\n'
+        return self._request + b'If-None-Match: ' + self.etag + b'\r\n\r\n'
+
+    def _connect(self):
+        if self._addr is None:
+            self._addr = socket.getaddrinfo(self.host, self.port, 0, socket.SOCK_STREAM)[0][-1]
+        sock = socket.socket()
+        try:
+            sock.settimeout(self.timeout)
+            sock.connect(self._addr)
+        except OSError:
+            sock.close()
+            raise
+        self._sock = sock
+
+    def _get(self):
+        if self._sock is None:
+            self._connect()
+        sock = self._sock
+        try:
+            sock.write(self._request_bytes())
+            line = sock.readline()
+            if not line:
+                raise OSError("connection closed")
+            status_code, keep_alive = _parse_status_line(line)
+            length = None
+            etag = None
+            while True:
+                line = sock.readline()
+                if not line or line == b'\r\n':
+                    break
+                length, keep_alive, etag = _parse_header_line(line, length, keep_alive, etag)
+            if status_code == 304:
+                # Not Modified never has a body
+                length = 0
+            elif status_code < 400:
+                self.etag = etag
+        except:
+            self.close()
+            raise
+        return _KeepAliveResponse(self, status_code, length, keep_alive and length is not None)
+
+class _KeepAliveResponse:
+    """Body of a KeepAliveHTTP response; close() leaves the connection ready for the next request."""
+    def __init__(self, http, status_code, length, keep_alive):
+        self._http = http
+        self._sock = http._sock
+        self.status_code = status_code
+        self._left = length
+        self._keep_alive = keep_alive
+        # stream interface for iter_aircraft_json()
+        self.raw = self
+
+    def read(self, size):
+        """Read up to size bytes of the body; returns b'' at the end of the body."""
+        if self._left is not None:
+            if self._left <= 0:
+                return b''
+            size = min(size, self._left)
+        data = self._sock.read(size)
+        if not data:
+            self._keep_alive = False
+        elif self._left is not None:
+            self._left -= len(data)
+        return data
+
+    def close(self):
+        """Skip any unread body so the connection can be reused, or close it."""
+        if self._keep_alive:
+            try:
+                while self.read(512):
+                    pass
+            except OSError:
+                self._keep_alive = False
+        if not self._keep_alive:
+            self._http.close()
+
+class AsyncKeepAliveHTTP(KeepAliveHTTP):
+    """KeepAliveHTTP over asyncio streams, so other tasks run while a fetch waits on the network."""
+    def __init__(self, url, timeout=10):
+        super().__init__(url, timeout)
+        self._reader = None
+        self._writer = None
+
+    def close(self):
+        """Close the connection; the next get_aircraft() opens a new one."""
+        if self._writer is not None:
+            try:
+                self._writer.close()
+            except OSError:
+                pass
+            self._reader = None
+            self._writer = None
+
+    async def get_aircraft(self):
+        """Fetch the URL and return the records of its "aircraft" array as dicts, or None if not modified."""
+        if self._writer is not None:
+            try:
+                return await asyncio.wait_for(self._get_aircraft(), self.timeout)
+            except OSError:
+                # The server may have dropped the idle connection; retry once on a fresh one
+                self.close()
+        return await asyncio.wait_for(self._get_aircraft(), self.timeout)
+
+    async def _get_aircraft(self):
+        try:
+            if self._writer is None:
+                self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+            reader = self._reader
+            self._writer.write(self._request_bytes())
+            await self._writer.drain()
+            line = await reader.readline()
+            if not line:
+                raise OSError("connection closed")
+            status_code, keep_alive = _parse_status_line(line)
+            length = None
+            etag = None
+            while True:
+                line = await reader.readline()
+                if not line or line == b'\r\n':
+                    break
+                length, keep_alive, etag = _parse_header_line(line, length, keep_alive, etag)
+            if status_code >= 400:
+                raise Exception(f"HTTP error: Status code {status_code}")
+            if status_code == 304:
+                # Not Modified never has a body
+                return None
+            self.etag = etag
+            # Read the whole body so the connection can be reused, decoding
+            # records as they arrive
+            parser = AircraftJSONParser()
+            records = []
+            left = length
+            while left is None or left > 0:
+                chunk = await reader.read(512 if left is None else min(512, left))
+                if not chunk:
+                    keep_alive = False
+                    break
+                if left is not None:
+                    left -= len(chunk)
+                # Only records that may be in range can be shown; drop the rest now
+                for record in parser.feed(chunk):
+                    if Aircraft.may_be_in_range(record):
+                        records.append(record)
+        except:
+            self.close()
+            raise
+        if not keep_alive or length is None:
+            self.close()
+        return records
 
 class AircraftTracker:
     """Handles fetching aircraft data from dump1090"""
@@ -12,29 +338,143 @@ class AircraftTracker:
         self.aircraft = []
         self.status = "INITIALISING"
         self.last_update = time.time()
+        self.pool = AircraftPool()
+        self.http = KeepAliveHTTP(_cfg.DUMP1090_URL, timeout=10)
+        self.async_http = None
+        self.military_count = 0
+        # Incremented by poll_loop() each time self.aircraft is replaced
+        self.updates = 0
+        self.last_update_ticks_ms = 0
+        # Last fetched list, returned again while younger than FETCH_TTL_MS
+        # or when the server answers 304 Not Modified
+        self._cache = None
+        self._cache_ticks_ms = 0
+        # asyncio.Event while fetch_data_async() has a request in flight
+        self._inflight = None
+
+    def _cached(self):
+        """Return the last fetched list if it is younger than FETCH_TTL_MS, else None."""
+        if self._cache is not None and utime.ticks_diff(utime.ticks_ms(), self._cache_ticks_ms) < FETCH_TTL_MS:
+            return self._cache
+        return None
+
+    def _last(self):
+        """Return the result of the most recent fetch."""
+        return self._cache if self._cache is not None else []
+
+    def fetch_data(self, use_cache=True):
+        """Fetch aircraft from local dump1090
 
-    def fetch_data(self):
-        """Fetch aircraft from local dump1090"""
+        A list younger than FETCH_TTL_MS is returned again without a
+        request unless use_cache is False, as for the periodic loops whose
+        own interval already paces the requests.
+        """
+        cached = self._cached() if use_cache else None
+        if cached is not None:
+            return cached
+        if self._inflight is not None:
+            # An async fetch is already asking dump1090; blocking here could
+            # never see it finish, so answer with the last result instead
+            return self._last()
         self.status = "SCANNING"
         self.last_update = time.time()
         try:
-            print(f"Fetching aircraft data from {_cfg.DUMP1090_URL}")
-            response = requests.get(_cfg.DUMP1090_URL, timeout=10)
-            if response.status_code >= 400:
-                raise Exception(f"HTTP error: Status code {response.status_code}")
-            data = response.json()
-            n = len(data.get('aircraft', []))
-            print(f"Fetched {n} aircraft")
-            aircraft_list = []
-            for ac_data in data.get('aircraft', []):
-                ac = Aircraft.from_dict(ac_data)
-                if ac:
-                    aircraft_list.append(ac)
-                    print(f"{ac_data=}")
-            print(f"✅ Found {len(aircraft_list)} aircraft within {_cfg.RADIUS_NM}NM range")
-            self.status = "ACTIVE" if self.aircraft else "NO CONTACTS"
-            return aircraft_list
+            if DEBUG:
+                print(f"Fetching aircraft data from {_cfg.DUMP1090_URL}")
+            response = self.http.get()
+            try:
+                if response.status_code >= 400:
+                    raise Exception(f"HTTP error: Status code {response.status_code}")
+                if response.status_code == 304 and self._cache is not None:
+                    return self._unchanged()
+                # Decode the aircraft array record by record rather than
+                # building the whole JSON document with response.json()
+                aircraft_list = Aircraft.from_list(iter_aircraft_json(response.raw), pool=self.pool)
+            finally:
+                response.close()
+            return self._found(aircraft_list)
         except Exception as e:
-            print(f"❌ Error: Couldn't fetch aircraft data: {e}; skipping")
-            self.status = "FAILED"
-            return []
+            self.http.close()
+            return self._failed(e)
+
+    async def fetch_data_async(self, use_cache=True):
+        """Fetch aircraft from local dump1090 without blocking other asyncio tasks
+
+        Concurrent callers share one request: while a fetch is in flight,
+        later callers wait for it and return its result.  use_cache is as
+        for fetch_data().
+        """
+        cached = self._cached() if use_cache else None
+        if cached is not None:
+            return cached
+        if self._inflight is not None:
+            await self._inflight.wait()
+            return self._last()
+        self._inflight = asyncio.Event()
+        try:
+            return await self._fetch_async()
+        finally:
+            inflight, self._inflight = self._inflight, None
+            inflight.set()
+
+    async def _fetch_async(self):
+        self.status = "SCANNING"
+        self.last_update = time.time()
+        if self.async_http is None:
+            self.async_http = AsyncKeepAliveHTTP(_cfg.DUMP1090_URL, timeout=10)
+        try:
+            if DEBUG:
+                print(f"Fetching aircraft data from {_cfg.DUMP1090_URL}")
+            records = await self.async_http.get_aircraft()
+            if records is None and self._cache is not None:
+                return self._unchanged()
+            # Pooled Aircraft are updated here in one step, never while
+            # another task is part way through drawing them
+            return self._found(Aircraft.from_list(records, pool=self.pool))
+        except Exception as e:
+            self.async_http.close()
+            return self._failed(e)
+
+    async def poll_loop(self, interval_ms=1000):
+        """Replace self.aircraft with a fresh fetch every interval_ms; run as an asyncio task.
+
+        Fetches start interval_ms apart, so the time a fetch takes is
+        subtracted from the sleep rather than added to the period.
+        """
+        while True:
+            deadline = utime.ticks_add(utime.ticks_ms(), interval_ms)
+            # The cache is stamped when a fetch ends, so by the next
+            # deadline it is younger than interval_ms; bypass it
+            self.aircraft = await self.fetch_data_async(use_cache=False)
+            self.last_update_ticks_ms = utime.ticks_ms()
+            self.updates += 1
+            await asyncio.sleep_ms(max(0, utime.ticks_diff(deadline, utime.ticks_ms())))
+
+    def _unchanged(self):
+        self._cache_ticks_ms = utime.ticks_ms()
+        self.status = "ACTIVE" if self._cache else "NO CONTACTS"
+        return self._cache
+
+    def _found(self, aircraft_list):
+        self._cache = aircraft_list
+        self._cache_ticks_ms = utime.ticks_ms()
+        military_count = 0
+        for ac in aircraft_list:
+            if ac.is_military:
+                military_count += 1
+        self.military_count = military_count
+        if DEBUG:
+            print(f"✅ Found {len(aircraft_list)} aircraft within {_cfg.RADIUS_NM}NM range")
+        self.status = "ACTIVE" if aircraft_list else "NO CONTACTS"
+        return aircraft_list
+
+    def _failed(self, e):
+        print(f"❌ Error: Couldn't fetch aircraft data: {e}; skipping")
+        self.status = "FAILED"
+        self.military_count = 0
+        # Without a cached list a 304 could not be answered, so ask for the full document
+        self._cache = None
+        self.http.etag = None
+        if self.async_http is not None:
+            self.async_http.etag = None
+        return []
@@ -1,6 +1,8 @@
 import radar
 import wifi
 
-wifi.connect_to_wifi()
+# Association proceeds in the WLAN driver while the display starts up;
+# only the first fetch waits for it
+sta_if = wifi.start_connect()
 # radar.scope_loop(once=True)
-radar.scope_loop()
+radar.run(wifi.wait_for_wifi(sta_if))
@@ -1,22 +1,32 @@
 from cydr import CYD
 
 import utime
-import random
-import json
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
 
 from xglcd_font import XglcdFont
 from datatable import DataTable
-from aircraft import Aircraft
 from cfg import _cfg
 from scope import RadarScope
 from fetch import AircraftTracker
 
+# Print touch diagnostics to the console
+DEBUG = getattr(_cfg, "DEBUG", False)
+# Forget a hex code in previous_aircraft once it has been gone this long
+SEEN_FADE_MS = getattr(_cfg, "FADE_MS", 60000)
+# Start a fetch and frame this often, however long the previous one took
+POLL_MS = getattr(_cfg, "POLL_MS", 1000)
 
 class Radar:
     """
     Encapsulates the radar display logic, including scope and data table.
     Handles widget creation, updates, and styling.
     """
+    __slots__ = ('fb', 'config', 'status_font', 'table_font', 'radar_scope', 'data_table',
+                 'style', 'selected_hex', 'just_selected_hex', 'MAX_RADAR_STYLE',
+                 'SPLIT_SCREEN_STYLE', 'TABLE_ONLY_STYLE', '_last_table_sig', '_widgets')
 
     def __init__(self, fb, config, status_font, table_font):
         """
@@ -40,156 +50,271 @@ class Radar:
         self.MAX_RADAR_STYLE = 0
         self.SPLIT_SCREEN_STYLE = 1
         self.TABLE_ONLY_STYLE = 2
+        # What the table last drew; see draw_frame()
+        self._last_table_sig = None
+        # Widgets for every style, built once at startup so layout changes
+        # reuse them instead of reallocating on the heap
+        self._widgets = {style: self._build_widgets(style)
+                         for style in (self.MAX_RADAR_STYLE, self.SPLIT_SCREEN_STYLE, self.TABLE_ONLY_STYLE)}
 
-    def create_widgets(self, style=1):
-        """
-        Creates the radar scope and data table widgets based on the specified style.
-
-        Args:
-            style: The style to use for the widgets (0, 1, or 2).
-        """
-        self.style = style
+    def _build_widgets(self, style):
+        """Return a new (radar_scope, data_table) pair for the specified style."""
         if style == self.MAX_RADAR_STYLE:
             # Max-sized scope on top and shorter table below
-            self.radar_scope = RadarScope(
-                self.fb, center_x=120, center_y=116, radius=116,
-                font=self.status_font, config=self.config
-            )
-            self.data_table = DataTable(
-                self.fb, x=4, y=234, width=236, height=86,
-                table_font=self.table_font, compact=True
-            )
+            return (RadarScope(self.fb, center_x=120, center_y=116, radius=116,
+                               font=self.status_font, config=self.config),
+                    DataTable(self.fb, x=4, y=234, width=236, height=86,
+                              table_font=self.table_font, compact=True))
         elif style == self.SPLIT_SCREEN_STYLE:
             # Split screen, even sized scope on top and table below
-            self.radar_scope = RadarScope(
-                self.fb, center_x=120, center_y=80, radius=70,
-                font=self.status_font, config=self.config
-            )
-            self.data_table = DataTable(
-                self.fb, x=4, y=170, width=236, height=150,
-                table_font=self.table_font, status_font=self.status_font
-            )
+            return (RadarScope(self.fb, center_x=120, center_y=80, radius=70,
+                               font=self.status_font, config=self.config),
+                    DataTable(self.fb, x=4, y=170, width=236, height=150,
+                              table_font=self.table_font, status_font=self.status_font))
         elif style == self.TABLE_ONLY_STYLE:
             # Only Table
-            self.radar_scope = None
-            self.data_table = DataTable(
-                self.fb, x=4, y=4, width=236, height=312,
-                table_font=self.table_font, status_font=self.status_font
-            )
+            return (None,
+                    DataTable(self.fb, x=4, y=4, width=236, height=312,
+                              table_font=self.table_font, status_font=self.status_font))
         else:
-            raise ArgumentException(f"unknown {style=}")
+            raise ValueError(f"unknown {style=}")
+
+    def create_widgets(self, style=1):
+        """
+        Selects the pre-built radar scope and data table widgets for the specified style.
+
+        Args:
+            style: The style to use for the widgets (0, 1, or 2).
+        """
+        if style not in self._widgets:
+            raise ValueError(f"unknown {style=}")
+        self.style = style
+        self.radar_scope, self.data_table = self._widgets[style]
 
     def switch_layout(self, s):
         self.create_widgets(s)
         # Selection persists across layout changes
         # Clear text cache when layout changes
         self.data_table.clear_cache()
+        self._last_table_sig = None
 
-# initialize display
-cyd = CYD(display_width=240, display_height=320, rotation=180)
-fb = cyd.display
-fb.clear(_cfg.BLACK)
+# Display, fonts, widgets and tracker are created by _init() on first use,
+# so importing this module does not load the fonts or touch the hardware
+cyd = None
+fb = None
+status_font = None
+table_font = None
+radar = None
+aircraft_tracker = None
 
-# sample aircraft dataset
+def _init():
+    """Initialize the display, fonts, widgets and aircraft tracker once."""
+    global cyd, fb, status_font, table_font, radar, aircraft_tracker
+    if cyd is not None:
+        return
+    cyd = CYD(display_width=240, display_height=320, rotation=180)
+    fb = cyd.display
+    fb.clear(_cfg.BLACK)
 
-status_font = XglcdFont('fonts/Neato5x7.c', 5, 7, letter_count=223)
-table_font = XglcdFont('fonts/FixedFont5x8.c', 5, 8, letter_count=223)
-radar = Radar(fb, _cfg, status_font, table_font)
-radar.create_widgets(radar.MAX_RADAR_STYLE)
-aircraft_tracker = AircraftTracker()
+    status_font = XglcdFont('fonts/Neato5x7.c', 5, 7, letter_count=223)
+    table_font = XglcdFont('fonts/FixedFont5x8.c', 5, 8, letter_count=223)
+    radar = Radar(fb, _cfg, status_font, table_font)
+    radar.create_widgets(radar.MAX_RADAR_STYLE)
+    aircraft_tracker = AircraftTracker()
 
 def fetch_your_data():
     return aircraft_tracker.fetch_data()
 
+def draw_frame(aircraft_list, previous_aircraft, last_update_ticks_ms):
+    """Draw the scope blips and the table for aircraft_list; previous_aircraft maps recently seen hex codes to ticks_ms."""
+    if radar.radar_scope:
+        radar.radar_scope.draw_planes(aircraft_list, previous_aircraft, selected_hex=radar.selected_hex, just_selected_hex=radar.just_selected_hex)
+
+    now = utime.ticks_ms()
+    if radar.data_table:
+        # The tracker hands back the same list object until a fetch brings new
+        # data, so skip the table when neither it, the selection nor the
+        # footer's second has changed.  The list is held, not its id, so a
+        # new list cannot be mistaken for a freed one at the same address.
+        sig = (radar.selected_hex, now // 1000)
+        last = radar._last_table_sig
+        if last is None or last[0] is not aircraft_list or last[1] != sig:
+            radar._last_table_sig = (aircraft_list, sig)
+            radar.data_table.draw(aircraft_list, status="OK", last_update_ticks_ms=last_update_ticks_ms, selected_hex=radar.selected_hex,
+                                  military_count=aircraft_tracker.military_count)
+
+    # Clear just_selected after first draw
+    radar.just_selected_hex = None
+
+    for craft in aircraft_list:
+        hex_code = craft.hex_code
+        if hex_code is not None:
+            previous_aircraft[hex_code] = now
+    # Drop hex codes not seen for SEEN_FADE_MS so the dict stays bounded;
+    # the list of stale codes is only allocated when there is one
+    ticks_diff = utime.ticks_diff
+    stale = None
+    for hex_code in previous_aircraft:
+        if ticks_diff(now, previous_aircraft[hex_code]) > SEEN_FADE_MS:
+            if stale is None:
+                stale = []
+            stale.append(hex_code)
+    if stale is not None:
+        for hex_code in stale:
+            del previous_aircraft[hex_code]
+
 def scope_loop(once=False):
     """
     Continuous scope loop. Call from REPL or main.
     """
+    _init()
     start = utime.ticks_ms()
-    previous_aircraft = set()
+    previous_aircraft = {}
     if radar.radar_scope:
         radar.radar_scope.draw_scope()
 
     # Touch coordinates persist across loop iterations
     # Read only at end during sleep polling for simplicity
     x, y = 0, 0
+
+    # Bind module globals used every iteration to locals
+    ticks_ms = utime.ticks_ms
+    fetch = aircraft_tracker.fetch_data
     
     while True:
+        deadline = utime.ticks_add(ticks_ms(), POLL_MS)
         # Process touch event if we have one
         if x != 0 and y != 0:
             process_touch(x, y)
 
-        aircraft_list = fetch_your_data()
-        now = utime.ticks_ms()
+        # POLL_MS paces this loop, so always ask dump1090 (see fetch_data)
+        aircraft_list = fetch(use_cache=False)
+        draw_frame(aircraft_list, previous_aircraft, ticks_ms())
+        
+        if once:
+            break
 
-        if radar.radar_scope:
-            radar.radar_scope.draw_planes(aircraft_list, previous_aircraft, selected_hex=radar.selected_hex, just_selected_hex=radar.just_selected_hex)
+        x,y = touch_poll_wait(deadline)
+
+async def ui_loop(poll_ms=20):
+    """
+    Draw each new fetch from aircraft_tracker.poll_loop() and handle touches
+    while fetches are in progress.
+    """
+    _init()
+    previous_aircraft = {}
+    if radar.radar_scope:
+        radar.radar_scope.draw_scope()
+    # Bind module globals used every poll to locals; the widgets are not
+    # bound since a touch can switch the layout
+    tracker = aircraft_tracker
+    touches = cyd.touches
+    sleep_ms = asyncio.sleep_ms
+    drawn_updates = tracker.updates
+    touching = False
+    while True:
+        redraw = False
+        x, y = touches()
+        if x != 0 and y != 0:
+            # act once per press, not on every poll while the finger is down
+            if not touching:
+                process_touch(x, y)
+                redraw = True
+            touching = True
+        else:
+            touching = False
 
-        if radar.data_table:
-            radar.data_table.draw(aircraft_list, status="OK", last_update_ticks_ms=now, selected_hex=radar.selected_hex)
+        if redraw or tracker.updates != drawn_updates:
+            drawn_updates = tracker.updates
+            draw_frame(tracker.aircraft, previous_aircraft, tracker.last_update_ticks_ms)
 
-        # Clear just_selected after first draw
-        radar.just_selected_hex = None
+        await sleep_ms(poll_ms)
 
-        previous_aircraft.update(craft.hex_code for craft in aircraft_list if craft.hex_code is not None)
-        
-        if once:
-            break
+async def _poll(startup):
+    if startup is not None:
+        await startup
+    await aircraft_tracker.poll_loop(POLL_MS)
 
-        x,y = touch_poll_wait()
+async def _run(startup=None):
+    _init()
+    asyncio.create_task(_poll(startup))
+    await ui_loop()
 
-def touch_poll_wait():
-    # Sleep with touch polling for better responsiveness
+def run(startup=None):
+    """
+    Run the display with fetches in a background task, so touches are
+    handled while an HTTP request is in flight. Call from REPL or main.
+
+    startup, if given, is a coroutine (such as wifi.wait_for_wifi()) that
+    the fetch task awaits before its first request; the display is
+    initialized and the UI runs in the meantime.
+    """
+    asyncio.run(_run(startup))
+
+def touch_poll_wait(deadline=None):
+    # Sleep until deadline (ticks_ms; default one second from now) with
+    # touch polling for better responsiveness
     # Reset touch coordinates, then poll during sleep
     x, y = 0, 0
-    sleep_remaining = 1000
-    sleep_chunk = 100
-    while sleep_remaining > 0:
-        utime.sleep_ms(min(sleep_chunk, sleep_remaining))
-        sleep_remaining -= sleep_chunk
-            
-        # Check for touch during sleep - read touch only here
-        x, y = cyd.touches()
+    if deadline is None:
+        deadline = utime.ticks_add(utime.ticks_ms(), 1000)
+    sleep_chunk = 20
+    sleep_ms = utime.sleep_ms
+    ticks_ms = utime.ticks_ms
+    ticks_diff = utime.ticks_diff
+    touches = cyd.touches
+    while True:
+        # Check for touch during sleep - read touch only here; at least
+        # once even when the frame already ran past the deadline
+        x, y = touches()
         if x != 0 and y != 0:
             return (x,y)
-    return (0,0)
+        sleep_remaining = ticks_diff(deadline, ticks_ms())
+        if sleep_remaining <= 0:
+            return (0,0)
+        sleep_ms(min(sleep_chunk, sleep_remaining))
 
 def process_touch(x, y):
     # Style 2 (full-screen table): any touch toggles layout, no selection
     if radar.style == radar.TABLE_ONLY_STYLE:
-        print("fullscreen table touch - changing layout")
+        if DEBUG:
+            print("fullscreen table touch - changing layout")
         fb.clear(_cfg.BLACK)
         s = (radar.style + 1) % 3
         radar.switch_layout(s)
         if radar.radar_scope:
             radar.radar_scope.draw_scope()
         start = utime.ticks_ms()
-        previous_aircraft = set()
+        previous_aircraft = {}
     # Other modes: check table for selection, elsewhere for layout toggle
     elif radar.data_table.is_in_table_bounds(x, y):
         # Touch is within table bounds - handle selection only, never toggle layout
         picked_hex = radar.data_table.pick_hex(x, y)
         if picked_hex == 'deselect':
             # Touch in table area but not on a row - deselect
-            print("Deselecting aircraft")
+            if DEBUG:
+                print("Deselecting aircraft")
             radar.selected_hex = None
             radar.just_selected_hex = None
         elif picked_hex:
             # Touch is on a table row - toggle selection
             if radar.selected_hex == picked_hex:
                 # Same aircraft - deselect
-                print(f"Deselecting aircraft: {picked_hex}")
+                if DEBUG:
+                    print(f"Deselecting aircraft: {picked_hex}")
                 radar.selected_hex = None
                 radar.just_selected_hex = None
             else:
                 # Different aircraft - select and mark as just selected
-                print(f"Selected aircraft: {picked_hex}")
+                if DEBUG:
+                    print(f"Selected aircraft: {picked_hex}")
                 radar.selected_hex = picked_hex
                 radar.just_selected_hex = picked_hex
     elif radar.radar_scope:
         # Touch is completely outside data table - toggle layout
         # left third -> rotate style left; right third; rotate style right; center-third: redisplay same style
-        print("outside table touch - changing layout")
+        if DEBUG:
+            print("outside table touch - changing layout")
         fb.clear(_cfg.BLACK)
         s = radar.style
         rr = radar.radar_scope.radius / 3
@@ -201,6 +326,6 @@ def process_touch(x, y):
         if radar.radar_scope:
             radar.radar_scope.draw_scope()
         start = utime.ticks_ms()
-        previous_aircraft = set()
+        previous_aircraft = {}
     else:
         printf("ignoring touch at {(x,y)=}")
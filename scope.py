@@ -1,8 +1,103 @@
 import math
-import utime
+import micropython
+from array import array
+from utime import ticks_ms
+
+# sin() of each whole degree in Q10 fixed point (1024 = 1.0), for trail
+# directions; cos(d) is _SIN_Q10[(d + 90) % 360]
+_SIN_Q10 = array('h', [round(1024 * math.sin(math.radians(degree))) for degree in range(360)])
+# Fraction bits of the microdegree-to-pixel scales in draw_planes: each
+# product is about the pixel offset << 22, so it stays a small int (under
+# 2**30) out to 240 pixels from the center
+_PROJ_SHIFT = 22
+
+def _pip_spans(r, color):
+    """Split a filled circle of radius r into one (dx, dy, width, pixels) span per row.
+
+    The spans cover exactly the pixels fb.fill_circle() sets, relative to
+    the center, so whatever is around the pip is left alone.
+    """
+    left = [r] * (2 * r + 1)
+    right = [-r] * (2 * r + 1)
+
+    def vline(x, y, h):
+        for row in range(y, y + h):
+            if x < left[row + r]:
+                left[row + r] = x
+            if x > right[row + r]:
+                right[row + r] = x
+
+    # Same midpoint walk as fill_circle(), centered at (0, 0)
+    f = 1 - r
+    dx = 1
+    dy = -r - r
+    x = 0
+    y = r
+    vline(0, -r, 2 * r + 1)
+    while x < y:
+        if f >= 0:
+            y -= 1
+            dy += 2
+            f += dy
+        x += 1
+        dx += 2
+        f += dx
+        vline(x, -y, 2 * y + 1)
+        vline(-x, -y, 2 * y + 1)
+        vline(-y, -x, 2 * x + 1)
+        vline(y, -x, 2 * x + 1)
+    pixel = color.to_bytes(2, 'big')
+    # each row of a circle is one unbroken run
+    return [(left[i], i - r, right[i] - left[i] + 1, pixel * (right[i] - left[i] + 1))
+            for i in range(2 * r + 1)]
+
+def _text_sprite(font, text, color, background, spacing=1):
+    """Render text with an XglcdFont into one RGB565 buffer, laid out as fb.draw_text() does.
+
+    Returns (buf, width, height), or None if the font lacks a character.
+    """
+    height = font.height
+    letters = []
+    width = 0
+    for letter in text:
+        buf, w, _ = font.get_letter(letter, color, background)
+        if w == 0:
+            return None
+        letters.append((buf, w))
+        width += w + spacing
+    out = bytearray(background.to_bytes(2, 'big') * (width * height))
+    stride = width * 2
+    x = 0
+    for buf, w in letters:
+        row = w * 2
+        for r in range(height):
+            start = r * stride + x * 2
+            out[start:start + row] = buf[r * row:(r + 1) * row]
+        x += w + spacing
+    return out, width, height
+
+def _blip_box(x, y, trail, r):
+    """Bounding box (x0, y0, x1, y1) of a pip of radius r at (x, y) and its trail."""
+    x0, y0, x1, y1 = x - r, y - r, x + r, y + r
+    if trail is not None:
+        tx, ty = trail
+        if tx < x0:
+            x0 = tx
+        elif tx > x1:
+            x1 = tx
+        if ty < y0:
+            y0 = ty
+        elif ty > y1:
+            y1 = ty
+    return x0, y0, x1, y1
 
 class RadarScope:
     """Radar display component using CYD display primitives (expects fb=cyd.display)."""
+    __slots__ = ('fb', 'center_x', 'center_y', 'radius', 'font', 'cfg', '_drawn',
+                 '_y_scale', '_x_scale', '_lat0', '_lon0', '_r2', '_rings', '_pips',
+                 '_lat0_udeg', '_lon0_udeg', '_x_scale_q', '_y_scale_q',
+                 '_trail_min_q10', '_trail_span_q10', '_trail_max_speed', '_blink_mask')
+
     def __init__(self, fb, center_x, center_y, radius, font=None, config=None):
         """
         fb: cyd.display instance
@@ -17,42 +112,124 @@ class RadarScope:
         self.radius = radius
         self.font = font
         self.cfg = config
+        # What was last drawn for each aircraft: hex_code -> (x, y, trail end, pip_color, is_selected),
+        # or None when something drawn later covered it and it must be drawn again
+        self._drawn = {}
+        # Pre-rendered pip rows: (radius, color) -> list of (dx, dy, width, RGB565 bytes)
+        self._pips = {}
+        self.refresh()
+
+    def refresh(self):
+        """Recompute the constants derived from the config; draw_scope() calls this so config changes take effect."""
+        config = self.cfg
+        radius = self.radius
+        # lat/lon degrees to pixels, precomputed for lat_lon_to_screen()
+        range_km = config.RADIUS_NM * 1.852
+        self._y_scale = 111 * radius / range_km
+        self._x_scale = self._y_scale * math.cos(math.radians(config.LAT))
+        self._lat0 = config.LAT
+        self._lon0 = config.LON
+        self._r2 = radius * radius
+        # The same projection in integers for draw_planes: microdegrees to
+        # pixels, scaled by 2**_PROJ_SHIFT
+        self._lat0_udeg = int(config.LAT * 1000000)
+        self._lon0_udeg = int(config.LON * 1000000)
+        self._x_scale_q = round(self._x_scale * (1 << _PROJ_SHIFT) / 1000000)
+        self._y_scale_q = round(self._y_scale * (1 << _PROJ_SHIFT) / 1000000)
+        # Trail length limits in Q10 fixed point, see trail_end()
+        self._trail_min_q10 = int(config.TRAIL_MIN_LENGTH * 1024)
+        self._trail_span_q10 = int((config.TRAIL_MAX_LENGTH - config.TRAIL_MIN_LENGTH) * 1024)
+        self._trail_max_speed = int(config.TRAIL_MAX_SPEED)
+        # Military blips blink off while this ticks_ms bit is set (0x200: ~512 ms on, ~512 ms off)
+        self._blink_mask = getattr(config, "BLINK_MASK", 0x200) if config.BLINK_MILITARY else 0
+        # Range rings: (pixel radius, label)
+        self._rings = [(int((ring / 3) * radius), f"{int((ring / 3) * config.RADIUS_NM)}NM")
+                       for ring in range(1, 4)]
 
+    def draw_pip(self, x, y, r, color):
+        """Draw a filled pip of radius r with one block write per row instead of one per column."""
+        spans = self._pips.get((r, color))
+        if spans is None:
+            spans = self._pips[(r, color)] = _pip_spans(r, color)
+        fb = self.fb
+        if x < r or y < r or x + r >= fb.width or y + r >= fb.height:
+            # partly off screen, which draw_sprite would reject outright;
+            # fill_circle draws the columns that are on it
+            fb.fill_circle(x, y, r, color)
+            return
+        draw_sprite = fb.draw_sprite
+        for dx, dy, w, line in spans:
+            draw_sprite(line, x + dx, y + dy, w, 1)
+
+    def draw_label(self, x, y, text, color):
+        """Draw a callsign or waypoint label with its top left at (x, y).
+
+        With an XglcdFont the whole label is sent as one sprite instead of a
+        block write per glyph plus one per gap.
+        """
+        if self.font is None:
+            # draw_text8x8(x, y, text, color, background=...)
+            self.fb.draw_text8x8(x, y, text, color, background=self.cfg.BLACK)
+            return
+        sprite = _text_sprite(self.font, text, color, self.cfg.BLACK)
+        if sprite is not None:
+            buf, w, h = sprite
+            if x >= 0 and y >= 0 and x + w <= self.fb.width and y + h <= self.fb.height:
+                self.fb.draw_sprite(buf, x, y, w, h)
+                return
+        # clipped or unknown glyph: let draw_text draw what it can
+        self.fb.draw_text(x, y, text, self.font, color, self.cfg.BLACK)
+
+    @micropython.native
     def lat_lon_to_screen(self, lat, lon):
         """Convert lat/lon to screen coordinates (same math as original pygame code)."""
-        lat_km = (lat - self.cfg.LAT) * 111
-        lon_km = (lon - self.cfg.LON) * 111 * math.cos(math.radians(self.cfg.LAT))
-        range_km = self.cfg.RADIUS_NM * 1.852
-        x = self.center_x + (lon_km / range_km) * self.radius
-        y = self.center_y - (lat_km / range_km) * self.radius
-        dx = x - self.center_x
-        dy = y - self.center_y
-        if dx * dx + dy * dy <= self.radius * self.radius:
-            return int(x), int(y)
+        dx = (lon - self._lon0) * self._x_scale
+        dy = (self._lat0 - lat) * self._y_scale
+        if dx * dx + dy * dy <= self._r2:
+            return int(self.center_x + dx), int(self.center_y + dy)
+        return None
+
+    def trail_end(self, x, y, track, speed):
+        """Return the pixel end of the projection line for a pip at (x, y), or None for no track.
+
+        track and speed are always numbers; Aircraft stores 0 when dump1090 omits them.
+        """
+        if track > 0:
+            # Tracks come in whole degrees, so look the trig up rather than
+            # compute it, and keep the arithmetic in integers: the length is
+            # Q10 and the sine Q10, so their product is shifted down by 20
+            degree = int(track + 0.5) % 360
+            max_speed = self._trail_max_speed
+            speed = int(speed)
+            if speed >= max_speed:
+                trail_q10 = self._trail_min_q10 + self._trail_span_q10
+            else:
+                trail_q10 = self._trail_min_q10 + self._trail_span_q10 * speed // max_speed
+            return (((x << 20) + trail_q10 * _SIN_Q10[degree]) >> 20,
+                    ((y << 20) - trail_q10 * _SIN_Q10[(degree + 90) % 360]) >> 20)
         return None
 
     def draw_aircraft(self, aircraft, x, y, pip_color, track_color, show_label=True, is_selected=False, draw_selection_circle=False):
         """Draw an aircraft marker, trail and callsign using CYD API directly."""
+        self._draw_blip(aircraft, x, y, self.trail_end(x, y, aircraft.track, aircraft.speed),
+                        pip_color, track_color, show_label, is_selected, draw_selection_circle)
+
+    def _draw_blip(self, aircraft, x, y, trail, pip_color, track_color, show_label, is_selected, draw_selection_circle):
+        """draw_aircraft() with the trail end already computed by trail_end()."""
         # Draw yellow circle only when explicitly requested (on tap)
         if draw_selection_circle:
             self.fb.draw_circle(x, y, 6, self.cfg.YELLOW)
         
         # filled circle for aircraft
         if show_label:
-            self.fb.fill_circle(x, y, 3, pip_color)
+            self.draw_pip(x, y, 3, pip_color)
         else:
             # draw_pixel did not show up
             #self.fb.draw_pixel(x, y, pip_color) 
-            self.fb.fill_circle(x, y, 2, pip_color)
+            self.draw_pip(x, y, 2, pip_color)
         # projection line based on track and speed
-        if getattr(aircraft, "track", 0) and aircraft.track > 0:
-            track_rad = math.radians(aircraft.track)
-            min_length = self.cfg.TRAIL_MIN_LENGTH
-            max_length = self.cfg.TRAIL_MAX_LENGTH
-            max_speed = self.cfg.TRAIL_MAX_SPEED
-            trail_length = min_length + (max_length - min_length) * min(getattr(aircraft, "speed", 0), max_speed) / max_speed
-            tx = int(x + trail_length * math.sin(track_rad))
-            ty = int(y - trail_length * math.cos(track_rad))
+        if trail is not None:
+            tx, ty = trail
             # Use yellow track for selected aircraft
             line_color = self.cfg.YELLOW if is_selected else track_color
             self.fb.draw_line(tx, ty, x, y, line_color)
@@ -64,43 +241,99 @@ class RadarScope:
             if callsign is not None:
                 # Use yellow for newly-tracked (selected) planes, green for newly-heard ones
                 label_color = self.cfg.YELLOW if draw_selection_circle else pip_color
-                if self.font is not None:
-                    # draw_text(x, y, text, font, color, background)
-                    self.fb.draw_text(x + 8, y - 12, callsign, self.font, label_color, self.cfg.BLACK)
-                else:
-                    # draw_text8x8(x, y, text, color, background=...)
-                    self.fb.draw_text8x8(x + 8, y - 12, callsign, label_color, background=self.cfg.BLACK)
+                self.draw_label(x + 8, y - 12, callsign, label_color)
 
     def draw_planes(self, aircraft_list, previous_aircraft=None, selected_hex=None, just_selected_hex=None):
         """Draw planes
         
         Args:
             aircraft_list: List of aircraft to draw
-            previous_aircraft: Set of previously drawn aircraft hex codes
+            previous_aircraft: Set or dict keyed by previously drawn aircraft hex codes
             selected_hex: Currently selected aircraft hex code
             just_selected_hex: Aircraft that was just tapped (to draw selection circle)
         """
 
-        # blink state for military blips
-        blink_state = ((utime.ticks_ms() // 500) & 1) == 0
+        # Bind config colors and methods to locals once rather than per aircraft
+        BRIGHT_GREEN = self.cfg.BRIGHT_GREEN
+        # blink state for military blips; military blips are hidden (None) while blinked off
+        military_color = None if ticks_ms() & self._blink_mask else self.cfg.RED
+        DIM_GREEN = self.cfg.DIM_GREEN
+        draw_blip = self._draw_blip
+        trail_end = self.trail_end
+        last_drawn = self._drawn
+        drawn = self._drawn = {}
+        # lat_lon_to_screen() inlined, saving a call and a tuple per aircraft,
+        # and done in integers from the microdegrees Aircraft keeps, so no
+        # float is boxed per plane
+        lat0, lon0 = self._lat0_udeg, self._lon0_udeg
+        x_scale, y_scale = self._x_scale_q, self._y_scale_q
+        r2 = self._r2
+        center_x, center_y = self.center_x, self.center_y
+        shift = _PROJ_SHIFT
+        show_all_labels = previous_aircraft is None
+        # Widest a label character can be, with draw_text's 1 pixel spacing
+        label_w = self.font.width + 1 if self.font is not None else 8
+        # (hex_code, x0, y0, x1, y1) of each blip drawn over what was on screen
+        dirty = None
 
         for aircraft in aircraft_list:
-            pos = self.lat_lon_to_screen(aircraft.lat, aircraft.lon)
-            if pos:
-                x, y = pos
-                show_label = previous_aircraft is None or aircraft.hex_code not in previous_aircraft
-                is_selected = (selected_hex is not None and aircraft.hex_code == selected_hex)
-                draw_circle = (just_selected_hex is not None and aircraft.hex_code == just_selected_hex)
-                if aircraft.is_military:
-                    if not self.cfg.BLINK_MILITARY or blink_state:
-                        self.draw_aircraft(aircraft, x, y, self.cfg.RED, self.cfg.DIM_GREEN, show_label=show_label, is_selected=is_selected, draw_selection_circle=draw_circle)
-                else:
-                    self.draw_aircraft(aircraft, x, y, self.cfg.BRIGHT_GREEN, self.cfg.DIM_GREEN, show_label=show_label, is_selected=is_selected, draw_selection_circle=draw_circle)
+            pip_color = military_color if aircraft.is_military else BRIGHT_GREEN
+            if pip_color is None:
+                continue
+            dx = (aircraft.lon_udeg - lon0) * x_scale
+            dy = (lat0 - aircraft.lat_udeg) * y_scale
+            # floor to whole pixels, as int() of the float sum did
+            dx >>= shift
+            dy >>= shift
+            if dx * dx + dy * dy <= r2:
+                x = center_x + dx
+                y = center_y + dy
+                hex_code = aircraft.hex_code
+                show_label = show_all_labels or hex_code not in previous_aircraft
+                # hex_code is never None, so a None selection simply never matches
+                is_selected = hex_code == selected_hex
+                draw_circle = hex_code == just_selected_hex
+                # Skip a blip that is already on screen exactly as it would be
+                # drawn; compare pixels, not raw track/speed, so changes that
+                # do not move the pip or its trail by a pixel cost nothing
+                trail = trail_end(x, y, aircraft.track, aircraft.speed)
+                key = (x, y, trail, pip_color, is_selected)
+                drawn[hex_code] = key
+                last = last_drawn.get(hex_code, 0)
+                if not (show_label or draw_circle) and last == key:
+                    continue
+                draw_blip(aircraft, x, y, trail, pip_color, DIM_GREEN, show_label, is_selected, draw_circle)
+                # A None entry marks a repair (see below), which redraws the
+                # blip where it already was; anything else may have painted
+                # over a neighbour
+                if last is not None or show_label or draw_circle:
+                    x0, y0, x1, y1 = _blip_box(x, y, trail, 6 if draw_circle else 3)
+                    callsign = aircraft.callsign
+                    if (show_label or draw_circle) and callsign is not None:
+                        # label at (x + 8, y - 12), black background and all
+                        x1 = max(x1, x + 8 + len(callsign) * label_w)
+                        y0 = min(y0, y - 12)
+                    if dirty is None:
+                        dirty = []
+                    dirty.append((hex_code, x0, y0, x1, y1))
+
+        # Labels have black backgrounds and trails draw over whatever they
+        # cross, so a blip drawn this frame may have covered part of one
+        # that was skipped; mark those
+        # for a redraw next frame instead of leaving them missing until
+        # they move a pixel
+        if dirty is not None:
+            for hex_code in drawn:
+                x, y, trail = drawn[hex_code][:3]
+                bx0, by0, bx1, by1 = _blip_box(x, y, trail, 3)
+                for dirty_hex, x0, y0, x1, y1 in dirty:
+                    if dirty_hex != hex_code and x0 <= bx1 and bx0 <= x1 and y0 <= by1 and by0 <= y1:
+                        drawn[hex_code] = None
+                        break
 
     def draw_waypoints(self, waypoint_list, show_label=True):
         if waypoint_list:
             for (name,(lat, lon)) in waypoint_list.items():
-                print(f"self.draw_waypoint({name=}, {lat=}, {lon=}, {show_label=})")
                 self.draw_waypoint(name, lat, lon, show_label)
 
     def draw_waypoint(self, name, lat, lon, show_label=True):
@@ -108,21 +341,18 @@ class RadarScope:
         pos = self.lat_lon_to_screen(lat, lon)
         if pos and name:
             (x,y) = pos
-            if self.font is not None:
-                self.fb.draw_text(x - 5, y, name, self.font, self.cfg.AMBER, self.cfg.BLACK)
-            else:
-                self.fb.draw_text8x8(x - 5, y, name, self.cfg.AMBER, background=self.cfg.BLACK)
+            self.draw_label(x - 5, y, name, self.cfg.AMBER)
 
     def draw_scope(self):
         """Draw radar rings, crosshairs, and aircraft. Does not clear entire screen."""
-        for ring in range(1, 4):
-            ring_radius = int((ring / 3) * self.radius)
+        # The screen was cleared, so no blip is on it any more
+        self._drawn = {}
+        self.refresh()
+        for ring_radius, label in self._rings:
             self.fb.draw_circle(self.center_x, self.center_y, ring_radius, self.cfg.DIM_GREEN)
 
             # label ring
             if self.cfg.LABEL_RING:
-                range_nm = int((ring / 3) * self.cfg.RADIUS_NM)
-                label = "{}NM".format(range_nm)
                 if self.font is not None:
                     self.fb.draw_text(self.center_x + ring_radius - 20, self.center_y + 5, label, self.font, self.cfg.DIM_GREEN, self.cfg.BLACK)
                 else:
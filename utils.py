@@ -2,15 +2,68 @@
 
 import math
 
-def calculate_distance_bearing(lat1: float, lon1: float, lat2: float, lon2: float):
-    """Calculate distance in nautical miles and bearing in degrees"""
-    lat1_rad, lon1_rad = math.radians(lat1), math.radians(lon1)
-    lat2_rad, lon2_rad = math.radians(lat2), math.radians(lon2)
-    dlat, dlon = lat2_rad - lat1_rad, lon2_rad - lon1_rad
+try:
+    import micropython
+except ImportError:
+    # Running under CPython (e.g. aircraft.test_it on a PC): the code
+    # emitter decorators have nothing to do, so make them pass-throughs.
+    class micropython:
+        @staticmethod
+        def native(f):
+            return f
+
+@micropython.native
+def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float):
+    """Calculate great-circle distance in nautical miles"""
+    lat1_rad, lat2_rad = math.radians(lat1), math.radians(lat2)
+    dlat, dlon = lat2_rad - lat1_rad, math.radians(lon2) - math.radians(lon1)
     a = math.sin(dlat/2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon/2)**2
-    distance_km = 2 * math.asin(math.sqrt(a)) * 6371
-    distance_nm = distance_km * 0.539957
+    distance_km = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a)) * 6371
+    return distance_km * 0.539957
+
+@micropython.native
+def initial_bearing(lat1: float, lon1: float, lat2: float, lon2: float):
+    """Calculate initial bearing in degrees"""
+    lat1_rad, lat2_rad = math.radians(lat1), math.radians(lat2)
+    dlon = math.radians(lon2) - math.radians(lon1)
     y = math.sin(dlon) * math.cos(lat2_rad)
     x = math.cos(lat1_rad) * math.sin(lat2_rad) - math.sin(lat1_rad) * math.cos(lat2_rad) * math.cos(dlon)
-    bearing = (math.degrees(math.atan2(y, x)) + 360) % 360
-    return distance_nm, bearing
+    return (math.degrees(math.atan2(y, x)) + 360) % 360
+
+def origin_terms(lat0: float, lon0: float):
+    """Precompute the trig terms of an origin for distance_bearing_from()."""
+    lat0_rad = math.radians(lat0)
+    return lat0_rad, math.radians(lon0), math.sin(lat0_rad), math.cos(lat0_rad)
+
+@micropython.native
+def distance_bearing_from(origin, lat: float, lon: float, max_distance=None):
+    """Calculate distance (NM) and bearing (degrees) from an origin made by origin_terms().
+
+    The bearing is skipped and reported as None for a point beyond max_distance.
+    """
+    lat0_rad, lon0_rad, sin_lat0, cos_lat0 = origin
+    lat_rad = math.radians(lat)
+    cos_lat = math.cos(lat_rad)
+    dlat, dlon = lat_rad - lat0_rad, math.radians(lon) - lon0_rad
+    a = math.sin(dlat/2)**2 + cos_lat0 * cos_lat * math.sin(dlon/2)**2
+    distance = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a)) * 6371 * 0.539957
+    if max_distance is not None and distance > max_distance:
+        return distance, None
+    y = math.sin(dlon) * cos_lat
+    x = cos_lat0 * math.sin(lat_rad) - sin_lat0 * cos_lat * math.cos(dlon)
+    return distance, (math.degrees(math.atan2(y, x)) + 360) % 360
+
+@micropython.native
+def flat_distance_bearing_from(origin, lat: float, lon: float, max_distance=None):
+    """Flat-earth distance_bearing_from(): one sqrt and, in range, one atan2.
+
+    Treats the neighbourhood of the origin as a plane, which is within a
+    fraction of a percent of the great-circle figures out to 100NM or so.
+    """
+    lat0_rad, lon0_rad, _, cos_lat0 = origin
+    north = math.radians(lat) - lat0_rad
+    east = (math.radians(lon) - lon0_rad) * cos_lat0
+    distance = math.sqrt(north * north + east * east) * 6371 * 0.539957
+    if max_distance is not None and distance > max_distance:
+        return distance, None
+    return distance, (math.degrees(math.atan2(east, north)) + 360) % 360
@@ -1,23 +1,42 @@
 import network
 import time
 import sys
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
 
 import secrets
 
-def connect_to_wifi():
+def start_connect():
+    """Start associating with the access point and return the STA interface without waiting."""
     sta_if = network.WLAN()
     if not sta_if.isconnected():
         print('connecting to network...')
         sta_if.active(True)
         sta_if.connect(secrets.wifi_ssid, secrets.wifi_password)
-        # Wait for connection with a timeout
-        for i in range(50): # Roughly 5 seconds
-            if sta_if.isconnected():
-                break
-            time.sleep_ms(100)
+    return sta_if
 
+def _report(sta_if):
     if sta_if.isconnected():
         print('network config:', sta_if.ifconfig())
         print("Connected successfully!")
     else:
         print("Failed to connect to WiFi")
+
+def connect_to_wifi():
+    sta_if = start_connect()
+    # Wait for connection with a timeout
+    for i in range(50): # Roughly 5 seconds
+        if sta_if.isconnected():
+            break
+        time.sleep_ms(100)
+    _report(sta_if)
+
+async def wait_for_wifi(sta_if, timeout_ms=5000):
+    """Yield to other tasks until sta_if connects or timeout_ms passes; returns whether it connected."""
+    deadline = time.ticks_add(time.ticks_ms(), timeout_ms)
+    while not sta_if.isconnected() and time.ticks_diff(deadline, time.ticks_ms()) > 0:
+        await asyncio.sleep_ms(50)
+    _report(sta_if)
+    return sta_if.isconnected()